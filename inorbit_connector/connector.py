@@ -6,8 +6,10 @@
 # Standard
 import os
 import logging
+import re
 import threading
-from time import sleep
+from time import monotonic
+from typing import Callable
 
 # Third Party
 from inorbit_edge.models import RobotSessionModel
@@ -26,6 +28,11 @@ class Connector:
     disconnect() methods (with calls to the superclass).
     """
 
+    # Executable name filter for user scripts, compiled once for all instances
+    _USER_SCRIPT_REGEX = re.compile(r".*\.sh$")
+    # Maximum multiple of the update period to back off to while the loop is idle
+    _MAX_IDLE_BACKOFF = 16
+
     def __init__(self, robot_id: str, config: InorbitConnectorConfig, **kwargs) -> None:
         """Initialize a new InOrbit connector.
 
@@ -44,25 +51,39 @@ class Connector:
             create_user_scripts_dir (bool): The path to the user scripts directory.
                 Relevant only if register_user_scripts is True.
                 Default is False
+            daemon (bool): Run the execution loop on a daemon thread, which does not
+                keep the interpreter alive. Callers must then join() or otherwise keep
+                the main thread running. Default is False
         """
 
         # Common information
         self.robot_id = robot_id
         self.config = config
         self._last_published_frame_id = None
-
-        # Threading for the main run methods
+        # Custom command handlers, keyed by command name
+        self._command_handlers: dict[str, Callable[[list, dict], None]] = {}
+        # Camera instances registered on start(), and the config list they came from
+        self.__cameras: list[tuple[str, OpenCVCamera]] = []
+        self.__cameras_source = None
+
+        # Threading for the main run methods. The stop event lives as long as the
+        # connector: start() clears it and stop() sets it, it is never replaced.
         self.__stop_event = threading.Event()
-        self.__thread = threading.Thread(target=self.__run)
+        self.__daemon = kwargs.get("daemon", False)
+        self.__thread = self.__create_thread()
 
         # Logging information
         self._logger = logging.getLogger(__name__)
         self._logger.setLevel(config.log_level.value)
 
         # Set up environment variables
-        for env_var_name, env_var_value in config.env_vars.items():
-            self._logger.info(f"Setting environment variable '{env_var_name}'")
-            os.environ[env_var_name] = env_var_value
+        if config.env_vars:
+            self._logger.info("Setting %d environment variables", len(config.env_vars))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(
+                    "Environment variables: %s", ", ".join(config.env_vars)
+                )
+            os.environ.update(config.env_vars)
 
         # Create the robot session in InOrbit
         robot_session_config = RobotSessionModel(
@@ -73,7 +94,9 @@ class Connector:
             robot_name=robot_id,
             robot_key=config.inorbit_robot_key,
         )
-        self._robot_session = RobotSession(**robot_session_config.model_dump())
+        # The model is flat, so its field values can be passed as they are instead of
+        # serializing them with model_dump()
+        self._robot_session = RobotSession(**dict(robot_session_config))
 
         # If enabled, register user scripts
         if kwargs.get("register_user_scripts", False):
@@ -98,20 +121,26 @@ class Connector:
             path (str): The path to the user scripts directory.
             create (bool): Create the directory if it doesn't exist.
         """
-        if not os.path.exists(path):
+        if not os.path.isdir(path):
+            if os.path.exists(path):
+                # A file is in the way, it can neither be registered nor created
+                self._logger.warning("User_scripts path is not a directory: %s", path)
+                return
             if create:
-                self._logger.info(f"Creating user_scripts directory: {path}")
+                self._logger.info("Creating user_scripts directory: %s", path)
                 os.makedirs(path, exist_ok=True)
             else:
-                self._logger.warning(f"User_scripts directory not found: {path}")
+                self._logger.warning("User_scripts directory not found: %s", path)
                 return
-        if os.path.exists(path):
-            self._logger.info(f"Registering user_scripts path: {path}")
-            # NOTE: this only supports bash execution (exec_name_regex is set to
-            # files with '.sh' extension).
-            # More script types can be supported, but right now is only limited to
-            # bash scripts
-            self._robot_session.register_commands_path(path, exec_name_regex=r".*\.sh")
+        # At this point the directory is known to exist, no need to check again
+        self._logger.info("Registering user_scripts path: %s", path)
+        # NOTE: this only supports bash execution (exec_name_regex is set to
+        # files with '.sh' extension).
+        # More script types can be supported, but right now is only limited to
+        # bash scripts
+        self._robot_session.register_commands_path(
+            path, exec_name_regex=self._USER_SCRIPT_REGEX
+        )
 
     def _register_custom_command_handler(self, handler: callable) -> None:
         """Register a custom command handler.
@@ -124,10 +153,13 @@ class Connector:
             try:
                 handler(command_name, args, options)
             except Exception as e:
-                self._logger.error(f"Error handling command {command_name}: {e}")
                 self._logger.error(
-                    f"Failed to execute command '{command_name}' with args {args}. "
-                    f"Exception:\n{e}"
+                    "Failed to execute command '%s' with args %s: %s",
+                    command_name,
+                    args,
+                    e,
+                    # Only pay for formatting the traceback when debugging
+                    exc_info=self._logger.isEnabledFor(logging.DEBUG),
                 )
                 options["result_function"](
                     "1",
@@ -139,13 +171,30 @@ class Connector:
 
         self._robot_session.register_command_callback(handler_wrapper)
 
-    # noinspection PyUnusedLocal
+    def _register_command(
+        self, command_name: str, handler: Callable[[list, dict], None]
+    ) -> None:
+        """Register a handler for a single custom command.
+
+        Registered handlers are dispatched by the default _inorbit_command_handler(),
+        so subclasses can register handlers instead of overriding it.
+
+        Args:
+            command_name (str): The name of the command
+            handler (Callable): The handler, called with the command's arguments list
+                and options dictionary
+        """
+        self._command_handlers[command_name] = handler
+
     def _inorbit_command_handler(self, command_name: str, args: list, options: dict):
         """Callback method for command messages. This method is called when a command
         is received from InOrbit.
         Will automatically be registered if `register_custom_command_handler`
         constructor keyword argument is set.
 
+        The base method dispatches to the handlers registered with
+        _register_command(). Subclasses may override it to handle commands directly.
+
         Args:
             command_name (str): The name of the command
             args (list): The list of arguments
@@ -154,8 +203,13 @@ class Connector:
                 to indicate success or any other value to indicate failure. See
                 https://github.com/inorbit-ai/edge-sdk-python for usage information.
         """
-        # Overwrite this in subclass to handle custom commands
-        self._logger.warning(f"Custom command {command_name} not implemented.")
+        if handler := self._command_handlers.get(command_name):
+            handler(args, options)
+        else:
+            # No failure is reported through result_function: every command is sent to
+            # all the session's callbacks, so another one (e.g. user scripts) may be
+            # handling it and has reported its own result
+            self._logger.warning("Custom command %s not implemented.", command_name)
 
     def _connect(self) -> None:
         """Connect to any external services.
@@ -189,7 +243,7 @@ class Connector:
         self._robot_session.disconnect()
 
     # noinspection PyMethodMayBeStatic
-    def _execution_loop(self) -> None:
+    def _execution_loop(self) -> bool | None:
         """The main execution loop for the connector.
 
         This method should be overridden by subclasses to provide the execution loop for
@@ -197,6 +251,13 @@ class Connector:
         should not be called directly. Instead, call the start() or stop() methods to
         start or stop the connector. This ensures that the connector is only started or
         stopped once.
+
+        Implementations may return False to signal that there was no work to do. The
+        connector then backs off exponentially, up to _MAX_IDLE_BACKOFF times the update
+        period, until a call returns anything other than False.
+
+        Returns:
+            bool | None: False if the loop was idle, otherwise True or None
         """
 
         # Overwrite this in subclass to something useful
@@ -220,8 +281,9 @@ class Connector:
             self._last_published_frame_id = frame_id
         else:
             self._logger.error(
-                f"Map {frame_id} not found in the current configuration."
-                " Map message will not be sent."
+                "Map %s not found in the current configuration."
+                " Map message will not be sent.",
+                frame_id,
             )
 
     def publish_pose(
@@ -231,7 +293,7 @@ class Connector:
         published, it calls self.publish_map() to update the map.
         """
         if frame_id != self._last_published_frame_id:
-            self._logger.info(f"Updating map {frame_id} with new pose.")
+            self._logger.info("Updating map %s with new pose.", frame_id)
             self.publish_map(frame_id, is_update=True)
         self._robot_session.publish_pose(x, y, yaw, frame_id, *args, **kwargs)
 
@@ -241,6 +303,9 @@ class Connector:
         This method should be called to start the execution loop of this connector. It
         will block until the execution loop is started but run the loop on a new thread
         and will also call connect() to connect to any external services.
+
+        Unless the connector was created with daemon=True, the loop thread keeps the
+        process alive until stop() is called.
         """
 
         # Prevent starting already running thread
@@ -251,24 +316,23 @@ class Connector:
             self._connect()
 
             # Set up camera feeds
-            for idx, camera_config in enumerate(self.config.cameras):
+            for camera_id, camera in self.__get_cameras():
                 self._logger.info(
-                    f"Registering camera {idx}: {str(camera_config.video_url)}"
+                    "Registering camera %s: %s", camera_id, camera.video_url
                 )
-                # If values are None, use default instead
-                dump = camera_config.model_dump()
-                clean = {k: v for k, v in dump.items() if v is not None}
-                self._robot_session.register_camera(str(idx), OpenCVCamera(**clean))
+                self._robot_session.register_camera(camera_id, camera)
 
             # Create new thread if an old thread finished
-            self.__thread = threading.Thread(target=self.__run)
+            self.__thread = self.__create_thread()
             self.__thread.start()
 
     def join(self) -> None:
         """Join the execution loop of this connector.
 
         This method should be called to join the execution loop of this connector and
-        will block until it ends.
+        will block until it ends. When the connector was created with daemon=True,
+        the main thread must be kept alive, e.g. with this method, or the loop is
+        killed without disconnecting when the interpreter exits.
         """
         self.__thread.join()
 
@@ -287,13 +351,71 @@ class Connector:
         # Cleanup external connections
         self._disconnect()
 
+    def __get_cameras(self) -> list[tuple[str, OpenCVCamera]]:
+        """Get the camera instances to register, building them if needed.
+
+        The instances are reused across restarts while self.config.cameras is the
+        same list with the same length, so cameras added to the config, e.g. by a
+        subclass in _connect(), are picked up.
+
+        Returns:
+            list[tuple[str, OpenCVCamera]]: The camera ids and instances
+        """
+        cameras = self.config.cameras
+        if cameras is not self.__cameras_source or len(cameras) != len(self.__cameras):
+            # If values are None, use default instead
+            self.__cameras = [
+                (str(idx), OpenCVCamera(**cam.model_dump(exclude_none=True)))
+                for idx, cam in enumerate(cameras)
+            ]
+            self.__cameras_source = cameras
+        return self.__cameras
+
+    def __create_thread(self) -> threading.Thread:
+        """Create the thread that runs the execution loop.
+
+        The thread is named after the robot to make it identifiable when profiling
+        and is a daemon only if requested with the daemon constructor argument.
+
+        Returns:
+            threading.Thread: The new, not yet started, thread
+        """
+        return threading.Thread(
+            target=self.__run,
+            name=f"inorbit-connector:{self.robot_id}",
+            daemon=self.__daemon,
+        )
+
     def __run(self) -> None:
         """The main run thread method for the connector.
 
         This method will be called on a new thread and will run the execution loop of
-        the connector until the stop event is set.
+        the connector until the stop event is set. Ticks are scheduled against a
+        monotonic deadline so the execution time of the loop does not add to the
+        period, and the wait is done on the stop event so stop() interrupts it.
+        While the execution loop reports being idle the period is backed off.
         """
 
-        while not self.__stop_event.is_set():
-            self._execution_loop()
-            sleep(1.0 / self.config.update_freq)
+        # Bind everything used per tick to locals to avoid repeated attribute lookups
+        period = 1.0 / self.config.update_freq
+        max_step = period * self._MAX_IDLE_BACKOFF
+        execution_loop = self._execution_loop
+        is_stopped = self.__stop_event.is_set
+        wait = self.__stop_event.wait
+
+        step = period
+        next_tick = monotonic()
+        while not is_stopped():
+            if execution_loop() is False:
+                step = min(step * 2, max_step)
+            else:
+                step = period
+            next_tick += step
+            delay = next_tick - monotonic()
+            if delay > 0:
+                if wait(delay):
+                    break
+            elif delay < -step:
+                # Stalled for more than a full period, resync instead of bursting.
+                # Shorter overruns are absorbed by the following ticks.
+                next_tick = monotonic()
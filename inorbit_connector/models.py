@@ -5,17 +5,77 @@
 
 # Standard
 import os
+import re
+from functools import cache, partial
 from typing import List
 
 # Third-party
-import pytz
 from inorbit_edge.models import CameraConfig
 from inorbit_edge.robot import INORBIT_CLOUD_SDK_ROBOT_CONFIG_URL
-from pydantic import BaseModel, field_validator, HttpUrl, FilePath, DirectoryPath
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    HttpUrl,
+    TypeAdapter,
+    ValidationError,
+    FilePath,
+    DirectoryPath,
+)
 
 # InOrbit
 from inorbit_connector.utils import LogLevels, DEFAULT_TIMEZONE
 
+# Defaults read from the environment once, when the module is imported
+DEFAULT_API_KEY = os.getenv("INORBIT_API_KEY")
+DEFAULT_API_URL = os.getenv("INORBIT_API_URL", INORBIT_CLOUD_SDK_ROBOT_CONFIG_URL)
+
+# Matches the same characters as str.isspace(), but scans the string in C
+_WHITESPACE_REGEX = re.compile(r"\s")
+
+
+@cache
+def _all_timezones() -> frozenset[str]:
+    """Get the names of the timezones known to pytz.
+
+    pytz is imported on the first call, so importing this module does not load it.
+    pytz.all_timezones is a list, a set is built once for constant time lookups.
+
+    Returns:
+        frozenset[str]: The timezone names
+    """
+    import pytz
+
+    return frozenset(pytz.all_timezones)
+
+
+@cache
+def _parse_api_url(url: str) -> HttpUrl:
+    """Parse the INORBIT_API_URL default, once per distinct value.
+
+    Field defaults are not validated, so this is used to build the default api_url.
+    Parsing happens when a configuration first uses the default, not at import time,
+    so an invalid INORBIT_API_URL only fails configurations relying on it.
+
+    Args:
+        url (str): The URL to parse
+
+    Raises:
+        ValueError: If the URL is not a valid HTTP URL
+
+    Returns:
+        HttpUrl: The parsed URL, shared by all the configurations using it
+    """
+    try:
+        return TypeAdapter(HttpUrl).validate_python(url)
+    except ValidationError as e:
+        # Without this the error names neither the api_url field nor the variable
+        raise ValueError(
+            f"INORBIT_API_URL is not a valid HTTP URL: '{url}'"
+            f" ({e.errors()[0]['msg']})"
+        ) from e
+
 
 class MapConfig(BaseModel):
     """Class representing a map configuration.
@@ -28,6 +88,9 @@ class MapConfig(BaseModel):
         resolution (float): The resolution
     """
 
+    # Build the validation schema on first use instead of at import time
+    model_config = ConfigDict(defer_build=True)
+
     file: FilePath
     map_id: str
     origin_x: float
@@ -48,7 +111,7 @@ class MapConfig(BaseModel):
         Returns:
             FilePath: The given file path if it is a PNG file
         """
-        if not file.suffix.lower() == ".png":
+        if not file.name.lower().endswith(".png"):
             raise ValueError("The map file must be a PNG file")
         return file
 
@@ -89,8 +152,11 @@ class InorbitConnectorConfig(BaseModel):
             value is the value to set.
     """
 
-    api_key: str | None = os.getenv("INORBIT_API_KEY")
-    api_url: HttpUrl = os.getenv("INORBIT_API_URL", INORBIT_CLOUD_SDK_ROBOT_CONFIG_URL)
+    # Build the validation schema on first use instead of at import time
+    model_config = ConfigDict(defer_build=True)
+
+    api_key: str | None = DEFAULT_API_KEY
+    api_url: HttpUrl = Field(default_factory=partial(_parse_api_url, DEFAULT_API_URL))
     cameras: List[CameraConfig] = []
     connector_type: str
     connector_config: BaseModel
@@ -103,23 +169,42 @@ class InorbitConnectorConfig(BaseModel):
     maps: dict[str, MapConfig] = {}
     env_vars: dict[str, str] = {}
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "InorbitConnectorConfig":
+        """Create a configuration from already validated values, skipping validation.
+
+        None of the validators run, so this must only be used with values that come
+        from a validated instance of the same class, e.g. dict(config). Nested values
+        must already be models: the output of model_dump() is not converted back.
+
+        Every field in data is marked as set, so model_dump(exclude_unset=True) of the
+        result may include fields that were defaults in the original instance.
+
+        Args:
+            data (dict): The field values of a validated configuration
+
+        Returns:
+            InorbitConnectorConfig: The configuration built from the given values
+        """
+        return cls.model_construct(**data)
+
     # noinspection PyMethodParameters
     @field_validator("api_key", "account_id")
-    def check_whitespace(cls, value: str) -> str:
+    def check_whitespace(cls, value: str | None) -> str | None:
         """Check if the api_key contains whitespace.
 
-        This is used for the api_key.
+        This is used for the api_key and account_id.
 
         Args:
-            value (str): The api_key to be checked
+            value (str | None): The api_key to be checked
 
         Raises:
             ValueError: If the api_key contains whitespace
 
         Returns:
-            str: The given value if it does not contain whitespaces
+            str | None: The given value if it does not contain whitespaces
         """
-        if any(char.isspace() for char in value):
+        if value is not None and _WHITESPACE_REGEX.search(value):
             raise ValueError("Whitespaces are not allowed")
         return value
 
@@ -139,7 +224,7 @@ class InorbitConnectorConfig(BaseModel):
         Raises:
             ValueError: If the provided timezone location is not valid
         """
-        if location_tz not in pytz.all_timezones:
+        if location_tz not in _all_timezones():
             raise ValueError("Timezone must exist in pytz")
         return location_tz
 
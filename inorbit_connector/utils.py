@@ -10,6 +10,12 @@ from enum import Enum
 # Third-party
 import yaml
 
+# Use the libyaml based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 DEFAULT_TIMEZONE = "UTC"
 
 
@@ -56,7 +62,7 @@ def read_yaml(fname: str, robot_id: str = None) -> dict:
         yaml.YAMLError: If the configuration file is not valid YAML
     """
     with open(fname, "r") as file:
-        data = yaml.safe_load(file)
+        data = yaml.load(file, Loader=YamlLoader)
 
         # When the file is empty, data is None
         if not data:
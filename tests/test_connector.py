@@ -6,8 +6,9 @@
 # Standard
 import os
 import logging
-from time import sleep
-from unittest.mock import Mock, patch, MagicMock
+from enum import Enum
+from time import monotonic, sleep
+from unittest.mock import ANY, Mock, patch, MagicMock
 
 # Third-party
 import pytest
@@ -103,9 +104,22 @@ class TestConnector:
             connector._connect = MagicMock()
             connector.start()
             connector._connect.assert_called_once()
-            mock_thread.assert_called()
+            mock_thread.assert_called_with(
+                target=ANY, name="inorbit-connector:TestRobot", daemon=False
+            )
             mock_thread().start.assert_called_once()
 
+    def test_start_daemon(self, base_model):
+        connector = Connector(
+            "TestRobot", InorbitConnectorConfig(**base_model), daemon=True
+        )
+        with patch("threading.Thread") as mock_thread:
+            connector._connect = MagicMock()
+            connector.start()
+            mock_thread.assert_called_with(
+                target=ANY, name="inorbit-connector:TestRobot", daemon=True
+            )
+
     def test_start_with_cameras(self, base_model):
         base_model["cameras"] = [CameraConfig(video_url="https://test.com/")]
         connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
@@ -176,6 +190,47 @@ class TestConnector:
             mock_thread.assert_called()
             mock_thread().start.assert_called_once()
 
+    def test_restart_reuses_cameras(self, base_model):
+        base_model["cameras"] = [CameraConfig(video_url="https://test.com/")]
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+        with patch("threading.Thread") as mock_thread:
+            mock_thread.return_value.is_alive.return_value = False
+            connector._connect = MagicMock()
+            connector._robot_session = MagicMock()
+
+            connector.start()
+            connector.start()
+
+            register_camera = connector._robot_session.register_camera
+            assert register_camera.call_count == 2
+            first, second = register_camera.call_args_list
+            assert first.args[0] == second.args[0] == "0"
+            assert first.args[1] is second.args[1]
+
+    def test_start_registers_cameras_added_on_connect(self, base_model):
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+
+        def connect():
+            connector.config.cameras.append(CameraConfig(video_url="https://test.com/"))
+
+        with patch("threading.Thread") as mock_thread:
+            mock_thread.return_value.is_alive.return_value = False
+            connector._connect = MagicMock(side_effect=connect)
+            connector._robot_session = MagicMock()
+
+            connector.start()
+            register_camera = connector._robot_session.register_camera
+            register_camera.assert_called_once_with("0", ANY)
+            assert register_camera.call_args.args[1].video_url == "https://test.com/"
+
+            # A second camera on restart rebuilds the instances
+            connector.start()
+            assert register_camera.call_count == 3
+            assert [c.args[0] for c in register_camera.call_args_list[1:]] == [
+                "0",
+                "1",
+            ]
+
     def test_stop(self, base_connector):
         with (
             patch.object(base_connector, "_disconnect") as mock_disconnect,
@@ -202,6 +257,52 @@ class TestConnector:
         sleep((1.0 / connector.config.update_freq) * 2)
         connector._execution_loop.assert_not_called()
 
+    def test_restart_reuses_stop_event(self, base_model):
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+        connector._execution_loop = MagicMock()
+        connector._robot_session = Mock()
+        stop_event = connector._Connector__stop_event
+
+        for _ in range(2):
+            connector.start()
+            assert not stop_event.is_set()
+            connector.stop()
+            assert stop_event.is_set()
+            assert connector._Connector__stop_event is stop_event
+
+    def test_stop_interrupts_wait(self, base_model):
+        base_model["update_freq"] = 0.1
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+        connector._execution_loop = MagicMock()
+        connector._robot_session = Mock()
+
+        connector.start()
+        sleep(0.1)
+        start = monotonic()
+        connector.stop()
+        # Stopping must not wait for the remainder of the 10 second period
+        assert monotonic() - start < 1.0
+        connector._execution_loop.assert_called_once()
+
+    def test_run_backs_off_when_idle(self, base_model):
+        base_model["update_freq"] = 50.0
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+        connector._robot_session = Mock()
+
+        # Without backoff this would tick around 25 times in half a second
+        connector._execution_loop = MagicMock(return_value=False)
+        connector.start()
+        sleep(0.5)
+        connector.stop()
+        assert 1 <= connector._execution_loop.call_count < 10
+
+        # Returning anything other than False keeps the configured rate
+        connector._execution_loop = MagicMock(return_value=None)
+        connector.start()
+        sleep(0.5)
+        connector.stop()
+        assert connector._execution_loop.call_count >= 15
+
     def test_publish_map(self, base_model):
         # Test with no maps
         connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
@@ -250,6 +351,25 @@ class TestConnector:
             connector.publish_pose(0, 0, 0, "frameB")
             assert mock_publish_map.call_count == 2  # Called again
 
+    def test_publish_pose_with_str_subclass_frame_id(self, base_model):
+        class Frame(str, Enum):
+            A = "frameA"
+
+        base_model["maps"] = {
+            "frameA": {
+                "file": f"{os.path.dirname(__file__)}/dir/test_map.png",
+                "map_id": "valid_map_id",
+                "origin_x": 0.0,
+                "origin_y": 0.0,
+                "resolution": 0.1,
+            },
+        }
+        connector = Connector("TestRobot", InorbitConnectorConfig(**base_model))
+        with patch.object(connector._robot_session, "publish_map") as mock_publish_map:
+            connector.publish_pose(0, 0, 0, Frame.A)
+            connector.publish_pose(0, 0, 0, Frame.A)
+            mock_publish_map.assert_called_once()
+
     def test_register_user_scripts(self, base_model, tmp_path):
         with patch(
             f"{RobotSession.__module__}.{RobotSession.__name__}"
@@ -281,6 +401,34 @@ class TestConnector:
                 default_user_scripts_dir=tmp_path,
             )
             mock_register_path.assert_called_once()
+            regex = mock_register_path.call_args.kwargs["exec_name_regex"]
+            assert regex.match("script.sh")
+            assert not regex.match("script.py")
+            assert not regex.match("script.shx")
+            mock_register_path.reset_mock()
+
+            # Test it does not register a path that is not a directory
+            not_a_dir = tmp_path / "script.sh"
+            not_a_dir.touch()
+            Connector(
+                "TestRobot",
+                InorbitConnectorConfig(**base_model),
+                register_user_scripts=True,
+                default_user_scripts_dir=not_a_dir,
+            )
+            mock_register_path.assert_not_called()
+            mock_register_path.reset_mock()
+
+            # Test it does not try to create a directory over an existing file
+            Connector(
+                "TestRobot",
+                InorbitConnectorConfig(**base_model),
+                register_user_scripts=True,
+                default_user_scripts_dir=not_a_dir,
+                create_user_scripts_dir=True,
+            )
+            assert not_a_dir.is_file()
+            mock_register_path.assert_not_called()
             mock_register_path.reset_mock()
 
             # Test it creates the scripts folder if specified
@@ -313,6 +461,51 @@ class TestConnector:
             )
             mock_register_callback.assert_not_called()
 
+    def test_register_command(self, base_connector):
+        handler = MagicMock()
+        base_connector._register_command("my_command", handler)
+        options = {"result_function": MagicMock()}
+
+        base_connector._inorbit_command_handler("my_command", ["a"], options)
+        handler.assert_called_once_with(["a"], options)
+
+        with patch.object(base_connector._logger, "warning") as mock_warning:
+            base_connector._inorbit_command_handler("other_command", [], options)
+            mock_warning.assert_called_once()
+        handler.assert_called_once()
+        # Unhandled commands may be handled by other callbacks, no result is reported
+        options["result_function"].assert_not_called()
+
+    def test_command_handler_error(self, base_model):
+        with patch(
+            f"{RobotSession.__module__}.{RobotSession.__name__}"
+            ".register_command_callback",
+            autospec=True,
+        ) as mock_register_callback:
+            connector = Connector(
+                "TestRobot",
+                InorbitConnectorConfig(**base_model),
+                register_custom_command_handler=False,
+            )
+            handler = MagicMock(side_effect=Exception("boom"))
+            connector._register_custom_command_handler(handler)
+            handler_wrapper = mock_register_callback.call_args.args[1]
+
+        result_function = MagicMock()
+        with patch.object(connector._logger, "error") as mock_error:
+            handler_wrapper("cmd", ["a"], {"result_function": result_function})
+            mock_error.assert_called_once()
+            assert mock_error.call_args.kwargs["exc_info"] is False
+        result_function.assert_called_once()
+        assert result_function.call_args.args[0] == "1"
+        assert result_function.call_args.kwargs["stderr"] == "boom"
+
+        # The traceback is only logged when debugging
+        connector._logger.setLevel(logging.DEBUG)
+        with patch.object(connector._logger, "error") as mock_error:
+            handler_wrapper("cmd", ["a"], {"result_function": result_function})
+            assert mock_error.call_args.kwargs["exc_info"] is True
+
     def test_uses_env_vars(self, base_model):
         base_model["env_vars"] = {"ENV_VAR": "env_value"}
         Connector("TestRobot", InorbitConnectorConfig(**base_model))
@@ -88,6 +88,14 @@ class TestInorbitConnectorConfig:
         )
         assert model.env_vars == {"ENV_VAR": "env_value"}
 
+    def test_from_trusted_dict(self, base_model):
+        model = InorbitConnectorConfig(**base_model)
+        # Validators are skipped
+        with mock.patch("inorbit_connector.models._all_timezones") as mock_timezones:
+            trusted = InorbitConnectorConfig.from_trusted_dict(dict(model))
+            mock_timezones.assert_not_called()
+        assert trusted == model
+
     def test_invalid_api_key(self, base_model):
         init_input = base_model.copy()
         init_input["api_key"] = "key with spaces"
@@ -100,6 +108,15 @@ class TestInorbitConnectorConfig:
         with pytest.raises(ValidationError, match="Whitespaces are not allowed"):
             InorbitConnectorConfig(**init_input)
 
+    def test_whitespace_check(self, base_model):
+        init_input = base_model.copy()
+        init_input["account_id"] = "account\tid"
+        with pytest.raises(ValidationError, match="Whitespaces are not allowed"):
+            InorbitConnectorConfig(**init_input)
+
+        init_input["account_id"] = None
+        assert InorbitConnectorConfig(**init_input).account_id is None
+
     def test_invalid_connector_config(self, base_model):
         init_input = {
             "connector_type": "valid_connector",
@@ -216,6 +233,21 @@ class TestInorbitConnectorConfig:
         model = InorbitConnectorConfig(**init_input)
         assert str(model.api_url) == INORBIT_CLOUD_SDK_ROBOT_CONFIG_URL
 
+    @mock.patch.dict(os.environ, {"INORBIT_API_URL": "not a url"})
+    def test_invalid_api_url_environment_variable(self, base_model):
+        # Re-import after Mock, an invalid URL must not break the import
+        importlib.reload(sys.modules["inorbit_connector.models"])
+        from inorbit_connector.models import InorbitConnectorConfig
+
+        # Only configurations relying on the default fail
+        model = InorbitConnectorConfig(**base_model)
+        assert str(model.api_url) == base_model["api_url"]
+        del base_model["api_url"]
+        with pytest.raises(
+            ValueError, match="INORBIT_API_URL is not a valid HTTP URL: 'not a url'"
+        ):
+            InorbitConnectorConfig(**base_model)
+
     def test_missing_api_key_environment_variable(self, base_model):
         init_input = {
             "connector_type": "valid_connector",